@@ -70,13 +70,17 @@ async def run_strategy():
     logger.info(f"{type(strategy).__name__} initialized successfully")
 
     # Main loop
-    while True:
-        try:
-            await strategy.execute()
-            await asyncio.sleep(30)  # Wait for 30 seconds before the next iteration
-        except Exception as e:
-            logger.error(f"Error in strategy execution: {e}")
-            await asyncio.sleep(30)  # Wait for 30 seconds before retrying
+    try:
+        while True:
+            try:
+                await strategy.execute()
+                await asyncio.sleep(30)  # Wait for 30 seconds before the next iteration
+            except Exception as e:
+                logger.error(f"Error in strategy execution: {e}")
+                await asyncio.sleep(30)  # Wait for 30 seconds before retrying
+    finally:
+        await strategy.close()
+        await drift_api.close()
 
 async def main():
     try:
@@ -87,4 +91,9 @@ async def main():
         logger.error(f"Unexpected error: {e}")
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    try:
+        import uvloop
+    except ImportError:
+        asyncio.run(main())
+    else:
+        uvloop.run(main())
\ No newline at end of file
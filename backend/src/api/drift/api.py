@@ -42,7 +42,6 @@ from driftpy.types import (
     TxParams
 )
 from driftpy.drift_client import DriftClient
-from driftpy.math.perp_position import calculate_entry_price
 from driftpy.account_subscription_config import AccountSubscriptionConfig, BulkAccountLoader
 from driftpy.constants.config import configs
 from driftpy.constants.perp_markets import (devnet_perp_market_configs, mainnet_perp_market_configs)
@@ -122,7 +121,7 @@ class DriftAPI:
 
         wallet = Wallet(kp)
 
-        logger.info(f"Using public key: {kp.pubkey()}")
+        logger.info("Using public key: %s", kp.pubkey())
 
         self.connection = AsyncClient(url)
         bulk_account_loader = BulkAccountLoader(self.connection)
@@ -148,7 +147,7 @@ class DriftAPI:
             await self.drift_client.subscribe()
             logger.info("Drift client subscribed successfully")
         except Exception as e:
-            logger.error(f"Error subscribing to Drift client: {str(e)}")
+            logger.error("Error subscribing to Drift client: %s", e)
             raise e
 
         # try:
@@ -166,13 +165,13 @@ class DriftAPI:
         """
         Closes the connection and cleans up resources.
         """
+        if self.drift_client:
+            # Stop the account subscriptions before the connection goes away
+            await self.drift_client.unsubscribe()
+            self.drift_client = None
         if self.connection:
             await self.connection.close()
             self.connection = None
-        if self.drift_client:
-            # If DriftClient has a close method, call it here
-            # await self.drift_client.close()
-            self.drift_client = None
         self.user_account = None
         self.keypair = None
         logger.info("DriftAPI connection closed and resources cleaned up.")
@@ -194,18 +193,18 @@ class DriftAPI:
         
         # Retrieve open orders asynchronously
         open_orders = await asyncio.to_thread(user.get_open_orders)
-        logger.info(f"Open orders: {open_orders}")
+        logger.debug("Open orders: %s", open_orders)
         
         # Filter orders for the specified market type and index
         matching_orders = [order for order in open_orders if order.market_type == market_type and order.market_index == market_index]
         
         if matching_orders:
-            logger.info(f'Canceling {len(matching_orders)} open orders for market type {market_type} and index {market_index}...')
+            logger.info('Canceling %s open orders for market type %s and index %s...', len(matching_orders), market_type, market_index)
             # Cancel the orders and get the transaction signature
             tx_sig = await self.drift_client.cancel_orders(market_type, market_index, sub_account_id=subaccount_id)
-            logger.info(f"Cancelled orders with transaction signature: {tx_sig}")
+            logger.info("Cancelled orders with transaction signature: %s", tx_sig)
         else:
-            logger.info(f"No open orders to cancel for market type {market_type} and index {market_index}.")
+            logger.info("No open orders to cancel for market type %s and index %s.", market_type, market_index)
 
     
     async def cancel_orders_for_market_and_direction(self, market_type: MarketType, market_index: int, direction: PositionDirection, subaccount_id: Optional[Pubkey] = None):
@@ -226,7 +225,7 @@ class DriftAPI:
         
         # Retrieve open orders asynchronously
         open_orders = await asyncio.to_thread(user.get_open_orders)
-        logger.info(f"Open orders: {open_orders}")
+        logger.debug("Open orders: %s", open_orders)
         # Filter orders for the specified market type, index, and direction
         matching_orders = [
             order for order in open_orders 
@@ -235,15 +234,15 @@ class DriftAPI:
             and order.direction == direction
         ]
         
-        logger.info(f"Matching orders: {matching_orders}")
+        logger.debug("Matching orders: %s", matching_orders)
         
         if matching_orders:
-            logger.info(f'Canceling {len(matching_orders)} open orders for market type {market_type} and index {market_index}...')
+            logger.info('Canceling %s open orders for market type %s and index %s...', len(matching_orders), market_type, market_index)
             # Cancel the orders and get the transaction signature
             tx_sig = await self.drift_client.cancel_orders(market_type, market_index, direction, sub_account_id=subaccount_id)
-            logger.info(f"Cancelled orders with transaction signature: {tx_sig}")
+            logger.info("Cancelled orders with transaction signature: %s", tx_sig)
         else:
-            logger.info(f"No open orders to cancel for market type {market_type} and index {market_index}.")
+            logger.info("No open orders to cancel for market type %s and index %s.", market_type, market_index)
 
     
     async def cancel_all_orders(self, subaccount_id: Optional[Pubkey] = None):
@@ -258,12 +257,12 @@ class DriftAPI:
         
         # Retrieve open orders asynchronously
         open_orders = await asyncio.to_thread(user.get_open_orders)
-        logger.info(f"Open orders: {open_orders}")
+        logger.debug("Open orders: %s", open_orders)
         
-        logger.info(f'Canceling {len(open_orders)} open orders...')
+        logger.info('Canceling %s open orders...', len(open_orders))
         # Cancel the orders and get the transaction signature
         tx_sig = await self.drift_client.cancel_orders(sub_account_id=subaccount_id)
-        logger.info(f"Cancelled orders with transaction signature: {tx_sig}")
+        logger.info("Cancelled orders with transaction signature: %s", tx_sig)
 
 
 
@@ -291,11 +290,11 @@ class DriftAPI:
                 raise ValueError(f"Unsupported market type: {order_params.market_type}")
 
             direction = "BUY" if order_params.direction == PositionDirection.Long() else "SELL"
-            logger.info(f"{order_params.market_type} limit {direction} order placed, order tx: {order_tx_sig}")
+            logger.info("%s limit %s order placed, order tx: %s", order_params.market_type, direction, order_tx_sig)
             return str(order_tx_sig)
 
         except Exception as e:
-            logger.error(f"Error placing order: {str(e)}")
+            logger.error("Error placing order: %s", e)
             return None
 
     def get_position(self, market_index: int, market_type: MarketType) -> Optional[PositionType]:
@@ -323,10 +322,10 @@ class DriftAPI:
         """
         try:
             self.user_account = self.drift_client.get_user_account(subaccount_id)
-            logger.info(f"User retrieved successfully. User ID: {self.user_account.authority}")
+            logger.info("User retrieved successfully. User ID: %s", self.user_account.authority)
             return self.user_account
         except Exception as e:
-            logger.error(f"Error retrieving user information: {str(e)}")
+            logger.error("Error retrieving user information: %s", e)
             raise  # This re-raises the caught exception
 
     # async def get_open_orders(self, subaccount_id: Optional[int] = None) -> list[Order]:
@@ -360,23 +359,23 @@ class DriftAPI:
             List[Order]: A list of open orders.
         """
         try:
-            logger.info(f"Attempting to get user for subaccount_id: {subaccount_id}")
+            logger.info("Attempting to get user for subaccount_id: %s", subaccount_id)
             user = self.drift_client.get_user(subaccount_id)
-            logger.info(f"Successfully retrieved user for subaccount_id: {subaccount_id}")
+            logger.info("Successfully retrieved user for subaccount_id: %s", subaccount_id)
 
             logger.info("Fetching open orders...")
             #open_orders = await asyncio.to_thread(user.get_open_orders)
             open_orders = user.get_open_orders()
 
             if open_orders:
-                logger.info(f"Retrieved {len(open_orders)} open orders.")
+                logger.info("Retrieved %s open orders.", len(open_orders))
                 for order in open_orders:
-                    logger.info(f"Order details: {order}")
+                    logger.debug("Order details: %s", order)
             else:
                 logger.warning("No open orders found.")
             return open_orders
         except Exception as e:
-            logger.error(f"Error retrieving open orders: {str(e)}", exc_info=True)
+            logger.exception("Error retrieving open orders: %s", e)
             logger.warning("Returning an empty list of orders due to the error.")
             return []
 
@@ -406,10 +405,10 @@ class DriftAPI:
             public_key = self.drift_client.wallet.public_key
             response = await connection.get_balance(public_key)
             balance = response.value
-            logger.info(f"Wallet balance retrieved successfully: {balance} lamports")
+            logger.info("Wallet balance retrieved successfully: %s lamports", balance)
             return balance
         except Exception as e:
-            logger.error(f"Error retrieving wallet balance: {str(e)}")
+            logger.error("Error retrieving wallet balance: %s", e)
             raise  # This re-raises the caught exception
 
     
@@ -424,7 +423,7 @@ class DriftAPI:
         try:
             position: Union[PerpPosition, SpotPosition] = await self.get_position(market_index, market_type)
             if position is None:
-                logger.info(f"No position found for market index {market_index}")
+                logger.info("No position found for market index %s", market_index)
                 return None, f"No position found for market index {market_index}"
             
             #tx_sig = None  # Initialize tx_sig to None
@@ -450,18 +449,18 @@ class DriftAPI:
                 )
                 tx_sig = await self.drift_client.place_spot_order(order_params)
             else:
-                logger.error(f"Unsupported market type: {market_type}")
+                logger.error("Unsupported market type: %s", market_type)
                 return None, f"Unsupported market type: {market_type}"
 
             if tx_sig:
-                logger.info(f"Position closed successfully: {tx_sig}")
+                logger.info("Position closed successfully: %s", tx_sig)
                 return tx_sig, None
             else:
                 logger.warning("No transaction signature returned when closing position")
                 return None
 
         except Exception as e:
-            logger.error(f"Error closing position: {str(e)}")
+            logger.error("Error closing position: %s", e)
             return None, str(e)
     
     
@@ -485,7 +484,7 @@ class DriftAPI:
         all_positions, error = self.get_all_open_positions()
         
         if error:
-            logger.error(f"Failed to retrieve open positions: {error}")
+            logger.error("Failed to retrieve open positions: %s", error)
             return results
 
         for account_id, positions in all_positions.items():
@@ -607,7 +606,7 @@ class DriftAPI:
                 "sub_account_id": sub_account_id
             }
         except Exception as e:
-            logger.error(f"Error cancelling order: {str(e)}")
+            logger.error("Error cancelling order: %s", e)
             return {
                 "success": False,
                 "message": f"Failed to cancel order: {str(e)}",
@@ -672,7 +671,7 @@ class DriftAPI:
                 "sub_account_id": sub_account_id
             }
         except Exception as e:
-            logger.error(f"Error modifying order: {str(e)}")
+            logger.error("Error modifying order: %s", e)
             return {
                 "success": False,
                 "message": f"Failed to modify order: {str(e)}",
@@ -764,10 +763,10 @@ class DriftAPI:
             elif market_type == MarketType.Spot():
                 return self.drift_client.get_oracle_price_data_for_spot_market(market_index)
             else:
-                logger.warning(f"Invalid market type: {market_type}")
+                logger.warning("Invalid market type: %s", market_type)
                 return None
         except Exception as e:
-            logger.error(f"Error getting market price data: {e}")
+            logger.error("Error getting market price data: %s", e)
             return None
 
     
@@ -812,7 +811,7 @@ class DriftAPI:
             elif order_params.market_type == MarketType.Spot():
                 order_tx_sig = await self.drift_client.place_spot_order(order_params)
             else:
-                logger.warning(f"Unsupported market type: {order_params.market_type}")
+                logger.warning("Unsupported market type: %s", order_params.market_type)
                 return None
 
             # Wait for the transaction to be confirmed
@@ -823,14 +822,14 @@ class DriftAPI:
 
             if order_id is not None:
                 direction = "BUY" if order_params.direction == PositionDirection.Long() else "SELL"
-                logger.info(f"{order_params.market_type} limit {direction} order placed, order tx: {order_tx_sig}, order ID: {order_id}")
+                logger.info("%s limit %s order placed, order tx: %s, order ID: %s", order_params.market_type, direction, order_tx_sig, order_id)
                 return str(order_tx_sig), order_id
             else:
-                logger.warning(f"Failed to retrieve order ID from transaction logs for tx: {order_tx_sig}")
+                logger.warning("Failed to retrieve order ID from transaction logs for tx: %s", order_tx_sig)
                 return str(order_tx_sig), None
 
         except Exception as e:
-            logger.error(f"Error placing limit order: {str(e)}")
+            logger.error("Error placing limit order: %s", e)
             return None
 
     async def get_order_id_from_tx_signature(self, connection: AsyncClient, tx_sig: str) -> Optional[int]:
@@ -845,12 +844,12 @@ class DriftAPI:
                             order_record = json.loads(json_str)
                             return order_record['order']['orderId']
                         except (ValueError, KeyError, json.JSONDecodeError) as e:
-                            logger.warning(f"Error parsing OrderRecord from log: {str(e)}")
+                            logger.warning("Error parsing OrderRecord from log: %s", e)
                             continue
-            logger.warning(f"No OrderRecord found in transaction logs for tx: {tx_sig}")
+            logger.warning("No OrderRecord found in transaction logs for tx: %s", tx_sig)
             return None
         except Exception as e:
-            logger.error(f"Error fetching transaction logs: {str(e)}")
+            logger.error("Error fetching transaction logs: %s", e)
             return None
     
     def get_user_orders_map(self) -> Dict[int, Order]:
@@ -44,7 +44,7 @@ class ErrorStatus(Enum):
         6242: "FailedToGetMint",
         6243: "FailedPhoenixCPI",
         6244: "FailedToDeserializePhoenixMarket",
-    },
+    }
     
     IGNORE = {
         6004: "SufficientCollateral",
@@ -66,7 +66,7 @@ class ErrorStatus(Enum):
         6200: "IFWithdrawRequestTooSmall",
         6204: "NewLPSizeTooSmall",
         6238: "UserNotInactive",
-    },
+    }
     
     CANCEL = {
         6002: "InsufficientDeposit",
@@ -139,7 +139,7 @@ class ErrorStatus(Enum):
         6226: "MarginOrdersOpen",
         6227: "TierViolationLiquidatingPerpPnl",
         6239: "RevertFill",
-    },
+    }
     
     BLOCK = {
         6000: "InvalidSpotMarketAuthority",
@@ -275,8 +275,9 @@ class ErrorStatus(Enum):
     }
     
     def error_status(error):
-        error_number = error["error"]["code"]
-        for status in ErrorStatus:
-            if error_number in status.value:
-                return status.name
+        return _STATUS_BY_CODE.get(error["error"]["code"])
+
+
+# Error code -> status name, built once instead of scanning every status per error
+_STATUS_BY_CODE = {code: status.name for status in ErrorStatus for code in status.value}
     
\ No newline at end of file
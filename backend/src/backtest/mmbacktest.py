@@ -65,7 +65,7 @@ class Backtester:
             current_price = Decimal(str(self.historical_data.iloc[i]['price']))
             
             # Update market maker
-            await self.market_maker.update_order_book()
+            await self.market_maker.update_order_book(await self.market_maker.get_trade_records())
             await self.market_maker.update_position()
             await self.market_maker.manage_inventory()
             await self.market_maker.place_orders()
@@ -2,10 +2,13 @@ import asyncio
 import pandas as pd
 import numpy as np
 from decimal import Decimal
-from typing import List, Dict, Tuple
+from typing import Deque, List, Dict, Tuple
+from collections import deque
 from datetime import datetime, date, timedelta
 from io import StringIO
+from concurrent.futures import ThreadPoolExecutor
 import requests
+from requests.adapters import HTTPAdapter
 import csv
 import matplotlib.pyplot as plt
 
@@ -40,24 +43,28 @@ class MockDriftAPI:
         return Position(int(self.position * BASE_PRECISION))
 
 # Function to get historical trade data (from the provided code)
-def get_trades_for_range(account_key, start_date, end_date):
-    """Retrieves trades for a given account and date range."""
+def get_trades_for_day(account_key, day, session=None):
+    """Retrieves trades for a given account on a single day, optionally through a shared session."""
+    url = f"https://drift-historical-data-v2.s3.eu-west-1.amazonaws.com/program/dRiftyHA39MWEi3m9aunc5MzRF1JYuBsbn6VPcn33UH/user/{account_key}/tradeRecords/{day.year}/{day.year}{day.month:02}{day.day:02}"
+    response = (session or requests).get(url)
+    response.raise_for_status()
+    # Parse CSV data
+    csv_data = StringIO(response.text)
+    reader = csv.reader(csv_data)
+    next(reader)  # Skip header
+    return list(reader)
+
+def get_trades_for_range(account_key, start_date, end_date, max_workers=8):
+    """Retrieves trades for a given account and date range, fetching the days concurrently."""
+    days = [start_date + timedelta(days=i) for i in range((end_date - start_date).days + 1)]
     all_trades = []
-    current_date = start_date
-    while current_date <= end_date:
-        year = current_date.year
-        month = current_date.month
-        day = current_date.day
-        url = f"https://drift-historical-data-v2.s3.eu-west-1.amazonaws.com/program/dRiftyHA39MWEi3m9aunc5MzRF1JYuBsbn6VPcn33UH/user/{account_key}/tradeRecords/{year}/{year}{month:02}{day:02}"
-        response = requests.get(url)
-        response.raise_for_status()
-        # Parse CSV data
-        csv_data = StringIO(response.text)
-        reader = csv.reader(csv_data)
-        next(reader)  # Skip header
-        for row in reader:
-            all_trades.append(row)  # Add each row to the list
-        current_date += timedelta(days=1)
+    # One pooled session for the whole range, with a connection per worker
+    with requests.Session() as session:
+        session.mount('https://', HTTPAdapter(pool_maxsize=max_workers))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            # map preserves the order of days, so trades stay chronological
+            for trades in executor.map(lambda day: get_trades_for_day(account_key, day, session), days):
+                all_trades.extend(trades)
     return all_trades
 
 # MarketMaker class (simplified for backtesting)
@@ -71,30 +78,28 @@ class MarketMaker:
         self.order_book = {'bids': [], 'asks': []}
         self.vwap = None
         self.volatility = Decimal('0.01')
-        self.price_history: List[Decimal] = []
+        self.price_history: Deque[Decimal] = deque(maxlen=20)
 
     async def update_position(self):
         position = await self.drift_api.get_position(self.market_index)
         if position:
-            self.position_size = Decimal(str(position.base_asset_amount)) / BASE_PRECISION
+            self.position_size = Decimal(position.base_asset_amount) / BASE_PRECISION
         else:
             self.position_size = Decimal('0')
 
-    def calculate_dynamic_spread(self) -> Decimal:
+    def calculate_dynamic_spread(self, current_price: Decimal) -> Decimal:
         spread = self.config.base_spread
         inventory_risk = abs(self.position_size - self.config.inventory_target) / self.config.max_position_size
         spread += self.config.risk_factor * inventory_risk
         if self.last_trade_price:
-            market_price_data = self.drift_api.get_market_price_data(self.market_index, self.config.market_type)
-            current_price = Decimal(str(market_price_data.price)) / PRICE_PRECISION
             price_change = abs(current_price - self.last_trade_price) / self.last_trade_price
             spread += price_change * Decimal('0.5')
         return spread
 
     def calculate_order_prices(self) -> Tuple[List[Decimal], List[Decimal]]:
-        spread = self.calculate_dynamic_spread()
         market_price_data = self.drift_api.get_market_price_data(self.market_index, self.config.market_type)
-        mid_price = Decimal(str(market_price_data.price)) / PRICE_PRECISION
+        mid_price = Decimal(market_price_data.price) / PRICE_PRECISION
+        spread = self.calculate_dynamic_spread(mid_price)
         half_spread = spread / 2
         buy_prices = [mid_price - half_spread - Decimal('0.01') * i for i in range(self.config.num_levels)]
         sell_prices = [mid_price + half_spread + Decimal('0.01') * i for i in range(self.config.num_levels)]
@@ -122,10 +127,9 @@ class MarketMaker:
         self.last_trade_price = price
         await self.update_position()
         self.price_history.append(price)
-        if len(self.price_history) > 20:
-            self.price_history.pop(0)
         if len(self.price_history) >= 2:
-            returns = [float(price / self.price_history[i - 1] - 1) for i, price in enumerate(self.price_history) if i > 0]
+            prices = np.array(self.price_history, dtype=float)
+            returns = prices[1:] / prices[:-1] - 1
             self.volatility = Decimal(str(np.std(returns) * np.sqrt(len(returns))))
 
 # Backtesting function
@@ -225,8 +229,8 @@ def calculate_sharpe_ratio(pnl_history: List[Tuple[datetime, float]]) -> float:
     :param pnl_history: List of tuples containing timestamps and cumulative PnL
     :return: Sharpe ratio
     """
-    returns = [pnl_history[i][1] - pnl_history[i-1][1] for i in range(1, len(pnl_history))]
-    if not returns:
+    returns = np.diff([pnl for _, pnl in pnl_history])
+    if not returns.size:
         return 0.0
     return float(np.mean(returns) / np.std(returns) * np.sqrt(252))  # Assuming daily returns and 252 trading days per year
 
@@ -237,15 +241,14 @@ def calculate_max_drawdown(pnl_history: List[Tuple[datetime, float]]) -> float:
     :param pnl_history: List of tuples containing timestamps and cumulative PnL
     :return: Maximum drawdown as a percentage
     """
-    pnl_values = [pnl for _, pnl in pnl_history]
-    peak = float('-inf')
-    max_drawdown = 0
-    for pnl in pnl_values:
-        if pnl > peak:
-            peak = pnl
-        drawdown = (peak - pnl) / peak if peak > 0 else 0
-        max_drawdown = max(max_drawdown, drawdown)
-    return max_drawdown
+    pnl_values = np.array([pnl for _, pnl in pnl_history], dtype=float)
+    if not pnl_values.size:
+        return 0.0
+    peak = np.maximum.accumulate(pnl_values)
+    # Drawdown is only measured once the running peak is positive
+    safe_peak = np.where(peak > 0, peak, 1.0)
+    drawdown = np.where(peak > 0, (peak - pnl_values) / safe_peak, 0.0)
+    return float(max(drawdown.max(), 0.0))
 
 # Function to plot backtest results
 def plot_backtest_results(results: Dict):
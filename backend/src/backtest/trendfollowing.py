@@ -1,5 +1,6 @@
 # Import these libraries
 import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
 import pandas as pd
 import matplotlib.pyplot as plt
 import matplotlib.dates as mdates
@@ -8,6 +9,11 @@ from backtesting import Backtest, Strategy
 from backtesting.lib import crossover
 import ccxt
 
+TIMEFRAME_SECONDS = {
+    '1m': 60, '5m': 300, '15m': 900, '30m': 1800,
+    '1h': 3600, '4h': 14400, '1d': 86400
+}
+
 # Strategy Class Definition
 class EnhancedALMAStrategy(Strategy):
     # Params
@@ -25,8 +31,9 @@ class EnhancedALMAStrategy(Strategy):
         self.smoothed_alma = self.I(lambda x: pd.Series(x).rolling(self.smoothing_factor).mean(), self.alma)
         self.atr = self.I(lambda x: pd.Series(x).rolling(self.atr_length).mean(), self.data.TR)
         self.dynamic_threshold = self.I(lambda x: pd.Series(x) * self.threshold_multiplier, self.atr)
-        self.upper_band = self.I(lambda x, y: pd.Series(x) + pd.Series(y).rolling(self.exhaustion_swing_length).std() * 1.5, self.smoothed_alma, self.data.Close)
-        self.lower_band = self.I(lambda x, y: pd.Series(x) - pd.Series(y).rolling(self.exhaustion_swing_length).std() * 1.5, self.smoothed_alma, self.data.Close)
+        self.band_width = self.I(lambda y: pd.Series(y).rolling(self.exhaustion_swing_length).std() * 1.5, self.data.Close, plot=False)
+        self.upper_band = self.I(lambda x, y: pd.Series(x) + pd.Series(y), self.smoothed_alma, self.band_width)
+        self.lower_band = self.I(lambda x, y: pd.Series(x) - pd.Series(y), self.smoothed_alma, self.band_width)
 
     def alma_calc(self, price, window, offset, sigma):
         m = np.floor(offset * (window - 1))
@@ -34,10 +41,14 @@ class EnhancedALMAStrategy(Strategy):
         w = np.exp(-((np.arange(window) - m) ** 2) / (2 * s * s))
         w /= w.sum()
 
-        def alma(x):
-            return (np.convolve(x, w[::-1], mode='valid'))[0]
+        # Weighted sum over every full window at once, rather than a Python call per row
+        series = pd.Series(price)
+        values = series.to_numpy(dtype=float)
+        alma = np.full(len(values), np.nan)
+        if len(values) >= window:
+            alma[window - 1:] = sliding_window_view(values, window) @ w
 
-        return pd.Series(price).rolling(window).apply(alma, raw=True)
+        return pd.Series(alma, index=series.index)
 
     def next(self):
         price = self.data.Close[-1]
@@ -96,11 +107,7 @@ def calculate_volatility(df, window=14):
 # Fetch historical data from Bybit (or another exchange, if you like)
 def fetch_data(symbol, timeframe, start_date, end_date):
     exchange = ccxt.bitstamp()
-    
-    timeframe_seconds = {
-        '1m': 60, '5m': 300, '15m': 900, '30m': 1800,
-        '1h': 3600, '4h': 14400, '1d': 86400
-    }
+    timeframe_step = pd.Timedelta(seconds=TIMEFRAME_SECONDS[timeframe])
     
     all_ohlcv = []
     current_date = pd.Timestamp(start_date).tz_localize(None)
@@ -111,7 +118,7 @@ def fetch_data(symbol, timeframe, start_date, end_date):
             ohlcv = exchange.fetch_ohlcv(symbol, timeframe, exchange.parse8601(current_date.isoformat()), limit=1000)
             all_ohlcv.extend(ohlcv)
             if len(ohlcv):
-                current_date = pd.Timestamp(ohlcv[-1][0], unit='ms') + pd.Timedelta(seconds=timeframe_seconds[timeframe])
+                current_date = pd.Timestamp(ohlcv[-1][0], unit='ms') + timeframe_step
             else:
                 current_date += pd.Timedelta(days=1)
         except Exception as e:
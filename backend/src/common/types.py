@@ -29,6 +29,10 @@ class Bot(ABC):
     async def health_check(self):
         pass
 
+    @abstractmethod
+    async def close(self):
+        pass
+
 
 @dataclass
 class BotConfig:
@@ -8,13 +8,15 @@ from datetime import datetime, timezone
 
 
 class ListenLogger(logging.Filter):
+    def __init__(self, name=""):
+        super().__init__(name)
+        # Resolved once; the working directory is fixed for the lifetime of the bot
+        self.root_path = os.path.abspath(os.getcwd())
+
     def filter(self, record):
-        path = record.pathname.replace(os.path.abspath(os.getcwd()), "")[:-3]
-        path = path.replace("/", ".")
-        path = path.replace("\\", ".")
-        if path[0] == ".":
-            path = path[1:]
-        record.name = path
+        path = record.pathname.removeprefix(self.root_path)[:-3]
+        path = path.replace("/", ".").replace("\\", ".")
+        record.name = path.removeprefix(".")
         return True
 
 
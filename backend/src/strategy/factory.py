@@ -5,15 +5,18 @@ from src.strategy.trendfollowing import TrendFollowingStrategy
 from src.api.drift.api import DriftAPI
 
 class StrategyFactory:
+    # strategy_type -> (strategy class, required config type)
+    STRATEGIES = {
+        "market_making": (MarketMaker, MarketMakerConfig),
+        "trend_following": (TrendFollowingStrategy, TrendFollowingConfig),
+    }
+
     @staticmethod
     def create_strategy(config: BotConfig, drift_api: DriftAPI):
-        if config.strategy_type == "market_making":
-            if not isinstance(config, MarketMakerConfig):
-                raise ValueError("MarketMakerConfig required for market_making strategy")
-            return MarketMaker(drift_api, config)
-        elif config.strategy_type == "trend_following":
-            if not isinstance(config, TrendFollowingConfig):
-                raise ValueError("TrendFollowingConfig required for trend_following strategy")
-            return TrendFollowingStrategy(drift_api, config)
-        else:
-            raise ValueError(f"Unknown strategy type: {config.strategy_type}")
\ No newline at end of file
+        try:
+            strategy_cls, config_cls = StrategyFactory.STRATEGIES[config.strategy_type]
+        except KeyError:
+            raise ValueError(f"Unknown strategy type: {config.strategy_type}") from None
+        if not isinstance(config, config_cls):
+            raise ValueError(f"{config_cls.__name__} required for {config.strategy_type} strategy")
+        return strategy_cls(drift_api, config)
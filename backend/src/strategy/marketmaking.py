@@ -1,11 +1,11 @@
 import asyncio
 import logging
 import time
-from typing import Dict, List, Tuple, Optional
+from collections import deque
+from typing import Deque, Dict, List, Tuple, Optional
 from decimal import Decimal
 import numpy as np 
 import aiohttp
-import requests
 import pandas as pd
 from io import StringIO
 from driftpy.types import OrderType, OrderParams, PositionDirection, MarketType # type: ignore
@@ -17,6 +17,13 @@ from src.common.types import MarketAccountType, MarketMakerConfig, Bot, Position
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+TRADE_RECORDS_COLUMNS = frozenset({'marketIndex', 'price', 'size'})
+TRADE_RECORDS_URL = 'https://drift-historical-data-v2.s3.eu-west-1.amazonaws.com/program/dRiftyHA39MWEi3m9aunc5MzRF1JYuBsbn6VPcn33UH/user/FrEFAwxdrzHxgc7S4cuFfsfLmcg8pfbxnkCQW83euyCS/tradeRecords/2024/20240929'
+
+# Hours with wider spreads around the expected open (14:00 UTC) and close (23:00 UTC)
+MARKET_OPEN_HOURS = frozenset({14, 15, 16})
+MARKET_CLOSE_HOURS = frozenset({21, 22})
+
 class MarketMaker(Bot):
     def __init__(self, drift_api: DriftAPI, config: MarketMakerConfig):
         """
@@ -35,26 +42,35 @@ class MarketMaker(Bot):
         
         self.inventory_extreme = Decimal('50')
         self.max_orders = 8
+        self.max_concurrent_orders = 4
+        self.retry_delay = 10
+        self.max_retry_delay = 300
         
         self.vwap = None
         self.last_price_update = 0
         self.price_update_interval = 60  # Update price every 60 seconds
         self.volatility = Decimal('0.01')  # Initial volatility estimate
         self.volatility_window = 20  # Number of price updates to use for volatility calculation
-        self.price_history: List[Decimal] = []
+        self.price_history: Deque[Decimal] = deque(maxlen=self.volatility_window)
         self.health_check_interval = 60
         self.last_health_check = 0
         self.is_healthy = True
         self.is_running = False
+        self.session: Optional[aiohttp.ClientSession] = None
+        self.trade_records: Optional[pd.DataFrame] = None
+        self.trade_records_etag: Optional[str] = None
         
     async def init(self):
         """
         Initialize the market maker by setting up the market index and initial position.
         """
+        # One session for the bot's lifetime, released in close()
+        self.session = aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=30))
+
         # Initialize the position
         position: Optional[PositionType] = await self.drift_api.get_position(self.market_index, self.config.market_type)
         if position:
-            self.position_size = Decimal(str(position.base_asset_amount)) / BASE_PRECISION
+            self.position_size = Decimal(position.base_asset_amount) / BASE_PRECISION
         else:
             self.position_size = Decimal('0')
         
@@ -123,36 +139,64 @@ class MarketMaker(Bot):
 
         return float(total_skew)
 
-    async def update_vwap(self):
-        """Update the Volume Weighted Average Price (VWAP)."""
+    async def update_vwap(self, df_filtered: Optional[pd.DataFrame]):
+        """
+        Update the Volume Weighted Average Price (VWAP).
+
+        :param df_filtered: Trade records for this market, as returned by get_trade_records
+        """
         current_time = time.time()
         if current_time - self.last_price_update < self.price_update_interval:
             return
 
+        if df_filtered is None:
+            return
+        if df_filtered.empty:
+            logger.warning(f"No data found for market index {self.market_index}")
+            return
+
+        self.vwap = (df_filtered['price'] * df_filtered['size']).sum() / df_filtered['size'].sum()
+        
+        self.last_price_update = current_time
+        logger.info(f"Updated VWAP: {self.vwap}")
+
+    async def get_trade_records(self) -> Optional[pd.DataFrame]:
+        """
+        Fetch the latest trade records for this market.
+
+        Called once per loop iteration, with the result shared by the order book and
+        VWAP updates. The file is revalidated with its ETag and only re-downloaded if
+        it changed.
+
+        :return: Trade records filtered to the market index, or None if the download failed
+        """
+        if self.session is None:
+            raise RuntimeError("MarketMaker.init() not called")
+
+        headers = {}
+        if self.trade_records is not None and self.trade_records_etag:
+            headers['If-None-Match'] = self.trade_records_etag
+
         try:
-            if self.session is None:
-                self.session = aiohttp.ClientSession()
-            
-            url = 'https://drift-historical-data-v2.s3.eu-west-1.amazonaws.com/program/dRiftyHA39MWEi3m9aunc5MzRF1JYuBsbn6VPcn33UH/user/FrEFAwxdrzHxgc7S4cuFfsfLmcg8pfbxnkCQW83euyCS/tradeRecords/2024/20240929'
-            async with self.session.get(url) as response:
+            async with self.session.get(TRADE_RECORDS_URL, headers=headers) as response:
+                if response.status == 304:
+                    return self.trade_records
                 response.raise_for_status()
                 content = await response.text()
-            
-            df = pd.read_csv(StringIO(content))
-            df_filtered = df[df['marketIndex'] == self.market_index]
-            
-            if df_filtered.empty:
-                logger.warning(f"No data found for market index {self.market_index}")
-                return
-            
-            df_filtered['volume'] = df_filtered['price'] * df_filtered['size']
-            total_volume = df_filtered['volume'].sum()
-            self.vwap = df_filtered['volume'].sum() / df_filtered['size'].sum()
-            
-            self.last_price_update = current_time
-            logger.info(f"Updated VWAP: {self.vwap}")
-        except Exception as e:
-            logger.error(f"Error updating VWAP: {str(e)}")
+                etag = response.headers.get('ETag')
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            logger.error(f"Error fetching trade records: {str(e)}")
+            return None
+
+        df = pd.read_csv(StringIO(content))
+        missing_columns = TRADE_RECORDS_COLUMNS - set(df.columns)
+        if missing_columns:
+            logger.warning(f"Trade records missing columns: {sorted(missing_columns)}")
+            return None
+
+        self.trade_records = df[df['marketIndex'] == self.market_index]
+        self.trade_records_etag = etag
+        return self.trade_records
             
             
     def _prices(self, bid_skew: float, ask_skew: float) -> Tuple[Optional[np.ndarray], Optional[np.ndarray]]:
@@ -248,9 +292,9 @@ class MarketMaker(Bot):
 
         # 4. Time-based adjustment (wider spreads during expected volatile periods)
         current_time = time.localtime()
-        if current_time.tm_hour in [14, 15, 16]:  # Assuming market opens at 14:00 UTC
+        if current_time.tm_hour in MARKET_OPEN_HOURS:
             time_factor = Decimal('1.2')  # 20% wider spreads during first 3 hours of trading
-        elif current_time.tm_hour in [21, 22]:  # Assuming market closes at 23:00 UTC
+        elif current_time.tm_hour in MARKET_CLOSE_HOURS:
             time_factor = Decimal('1.1')  # 10% wider spreads during last 2 hours of trading
         else:
             time_factor = Decimal('1')
@@ -271,12 +315,11 @@ class MarketMaker(Bot):
         if self.last_trade_price is None:
             return
 
-        self.price_history.append(self.last_trade_price)
-        if len(self.price_history) > self.volatility_window:
-            self.price_history.pop(0)
+        self.price_history.append(self.last_trade_price)  # deque drops the oldest price once full
 
         if len(self.price_history) >= 2:
-            returns = [float(price / self.price_history[i - 1] - 1) for i, price in enumerate(self.price_history) if i > 0]
+            prices = np.array(self.price_history, dtype=float)
+            returns = prices[1:] / prices[:-1] - 1
             self.volatility = Decimal(str(np.std(returns) * np.sqrt(len(returns))))
             logger.info(f"Updated volatility estimate: {self.volatility}")
             
@@ -333,7 +376,7 @@ class MarketMaker(Bot):
     async def start_interval_loop(self, interval_ms: int = 1000):
         while True:
             try:
-                await self.update_order_book()
+                await self.update_order_book(await self.get_trade_records())
                 await self.update_position()
                 await self.place_orders()
                 await asyncio.sleep(interval_ms / 1000)
@@ -364,11 +407,21 @@ class MarketMaker(Bot):
         logger.info("Market maker reset complete.")
         self.is_running = True
 
+    async def close(self):
+        """
+        Stop the market maker and release its HTTP session.
+        """
+        self.is_running = False
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+
     async def start_interval_loop(self, interval_ms: Optional[int] = 1000):
         """
         Start the main loop for the market making strategy.
         """
         self.is_running = True
+        consecutive_errors = 0
         while self.is_running:
             try:
                 await self.health_check()
@@ -377,20 +430,26 @@ class MarketMaker(Bot):
                     await self.reset()
                     continue
 
-                await self.update_order_book()
+                # Fetched once so both updates see the same download
+                trade_records = await self.get_trade_records()
+                await self.update_order_book(trade_records)
                 await self.update_position()
-                await self.update_vwap()
+                await self.update_vwap(trade_records)
                 await self.manage_inventory()
                 await self.place_orders()
                 
                 # Update last trade price
                 market = self.drift_api.get_market_price_data(self.market_index, self.config.market_type)
-                self.last_trade_price = Decimal(str(market.price)) / PRICE_PRECISION
+                self.last_trade_price = Decimal(market.price) / PRICE_PRECISION
                 
+                consecutive_errors = 0
                 await asyncio.sleep(interval_ms / 1000)
             except Exception as e:
-                logger.error(f"An error occurred: {str(e)}")
-                await asyncio.sleep(10)  # Wait for 10 seconds before retrying
+                # Back off exponentially while errors persist so a failing RPC isn't hammered
+                retry_delay = min(self.retry_delay * 2 ** consecutive_errors, self.max_retry_delay)
+                consecutive_errors += 1
+                logger.error(f"An error occurred: {str(e)}. Retrying in {retry_delay}s")
+                await asyncio.sleep(retry_delay)
 
     async def health_check(self):
         """
@@ -407,47 +466,38 @@ class MarketMaker(Bot):
                 logger.error(f"Health check failed: {e}")
                 self.is_healthy = False
 
-    async def update_order_book(self):
+    async def update_order_book(self, df_filtered: Optional[pd.DataFrame]):
         """
         Update the local order book with the latest market data from the API.
+
+        :param df_filtered: Trade records for this market, as returned by get_trade_records
         """
-        try:
-            # Fetch the latest trade records
-            url = 'https://drift-historical-data-v2.s3.eu-west-1.amazonaws.com/program/dRiftyHA39MWEi3m9aunc5MzRF1JYuBsbn6VPcn33UH/user/FrEFAwxdrzHxgc7S4cuFfsfLmcg8pfbxnkCQW83euyCS/tradeRecords/2024/20240929'
-            response = requests.get(url)
-            response.raise_for_status()
-            
-            # Parse the CSV data
-            df = pd.read_csv(StringIO(response.text))
-            
-            # Filter for the relevant market
-            df_filtered = df[df['marketIndex'] == self.market_index]
-            
-            if df_filtered.empty:
-                logger.warning(f"No data found for market index {self.market_index}")
-                return
-            
-            # Get the latest trade price
-            latest_trade = df_filtered.iloc[-1]
-            self.last_trade_price = Decimal(str(latest_trade['price'])) / PRICE_PRECISION
-            
-            # Simulate order book based on the latest trade price
-            mid_price = self.last_trade_price
-            
-            self.order_book = {
-                'bids': [(mid_price - Decimal('0.01') * i, Decimal('10')) for i in range(1, 6)],
-                'asks': [(mid_price + Decimal('0.01') * i, Decimal('10')) for i in range(1, 6)]
-            }
-            
-            logger.info(f"Updated order book - Mid price: {mid_price}")
-        except Exception as e:
-            logger.error(f"Error updating order book: {str(e)}")
+        if df_filtered is None:
+            return
+        if df_filtered.empty:
+            logger.warning(f"No data found for market index {self.market_index}")
+            return
+        
+        # Get the latest trade price
+        latest_trade = df_filtered.iloc[-1]
+        self.last_trade_price = Decimal(str(latest_trade['price'])) / PRICE_PRECISION
+        
+        # Simulate order book based on the latest trade price
+        mid_price = self.last_trade_price
+        
+        self.order_book = {
+            'bids': [(mid_price - Decimal('0.01') * i, Decimal('10')) for i in range(1, 6)],
+            'asks': [(mid_price + Decimal('0.01') * i, Decimal('10')) for i in range(1, 6)]
+        }
+        
+        logger.info(f"Updated order book - Mid price: {mid_price}")
 
 
-    def calculate_dynamic_spread(self) -> Decimal:
+    def calculate_dynamic_spread(self, current_price: Decimal) -> Decimal:
         """
         Calculate the dynamic spread based on current market conditions and inventory.
 
+        :param current_price: The current oracle price
         :return: The calculated spread as a Decimal
         """
         # Base spread
@@ -459,8 +509,6 @@ class MarketMaker(Bot):
         
         # Adjust spread based on market volatility
         if self.last_trade_price:
-            market_price_data = self.drift_api.get_market_price_data(self.market_index, self.config.market_type)
-            current_price = Decimal(str(market_price_data.price)) / PRICE_PRECISION
             price_change = abs(current_price - self.last_trade_price) / self.last_trade_price
             spread += price_change * Decimal('0.5')  # Increase spread by 50% of the price change
         
@@ -473,9 +521,9 @@ class MarketMaker(Bot):
 
         :return: Two lists of Decimals, representing buy and sell prices
         """
-        spread = self.calculate_dynamic_spread()
         market_price_data = self.drift_api.get_market_price_data(self.market_index, self.config.market_type)
-        mid_price = Decimal(str(market_price_data.price)) / PRICE_PRECISION
+        mid_price = Decimal(market_price_data.price) / PRICE_PRECISION
+        spread = self.calculate_dynamic_spread(mid_price)
         half_spread = spread / 2
         buy_prices = [mid_price - half_spread - Decimal('0.01') * i for i in range(self.config.num_levels)]
         sell_prices = [mid_price + half_spread + Decimal('0.01') * i for i in range(self.config.num_levels)]
@@ -490,52 +538,41 @@ class MarketMaker(Bot):
         await self.cancel_all_orders()
         
         buy_prices, sell_prices = self.calculate_order_prices()
-        
-        for i in range(self.config.num_levels):
-            # Place buy order
-            buy_params = OrderParams(
-                order_type=OrderType.Limit(),
-                market_type=self.config.market_type,
-                direction=PositionDirection.Long(),
-                base_asset_amount=int(self.config.order_size * BASE_PRECISION),
-                price=int(buy_prices[i] * PRICE_PRECISION),
-                market_index=self.market_index,
-                reduce_only=False
-            )
-            result = await self.drift_api.place_order_and_get_order_id(buy_params)
-            if result:
-                tx_sig, order_id = result
-                if order_id is not None:
-                    print(f"Order placed successfully. Tx sig: {tx_sig}, Order ID: {order_id}")
-                else:
-                    print(f"Order placed, but couldn't retrieve Order ID. Tx sig: {tx_sig}")
-            else:
-                print("Failed to place order")
+        base_asset_amount = int(self.config.order_size * BASE_PRECISION)
 
-            self.current_orders[order_id] = buy_params
-            
-            # Place sell order
-            sell_params = OrderParams(
-                order_type=OrderType.Limit(),
-                market_type=self.config.market_type,
-                direction=PositionDirection.Short(),
-                base_asset_amount=int(self.config.order_size * BASE_PRECISION),
-                price=int(sell_prices[i] * PRICE_PRECISION),
-                market_index=self.market_index,
-                reduce_only=False
-            )
-            result = await self.drift_api.place_order_and_get_order_id(sell_params)
-            
+        orders: List[OrderParams] = []
+        for i in range(self.config.num_levels):
+            for direction, price in ((PositionDirection.Long(), buy_prices[i]), (PositionDirection.Short(), sell_prices[i])):
+                orders.append(OrderParams(
+                    order_type=OrderType.Limit(),
+                    market_type=self.config.market_type,
+                    direction=direction,
+                    base_asset_amount=base_asset_amount,
+                    price=int(price * PRICE_PRECISION),
+                    market_index=self.market_index,
+                    reduce_only=False
+                ))
+
+        # Each placement waits for confirmation, so submit them concurrently,
+        # bounded to avoid tripping RPC rate limits
+        semaphore = asyncio.Semaphore(self.max_concurrent_orders)
+
+        async def place(order_params: OrderParams):
+            async with semaphore:
+                return await self.drift_api.place_order_and_get_order_id(order_params)
+
+        results = await asyncio.gather(*(place(order_params) for order_params in orders))
+
+        for order_params, result in zip(orders, results):
             if result:
                 tx_sig, order_id = result
                 if order_id is not None:
-                    print(f"Order placed successfully. Tx sig: {tx_sig}, Order ID: {order_id}")
+                    logger.info(f"Order placed successfully. Tx sig: {tx_sig}, Order ID: {order_id}")
+                    self.current_orders[order_id] = order_params
                 else:
-                    print(f"Order placed, but couldn't retrieve Order ID. Tx sig: {tx_sig}")
+                    logger.warning(f"Order placed, but couldn't retrieve Order ID. Tx sig: {tx_sig}")
             else:
-                print("Failed to place order")
-
-            self.current_orders[order_id] = sell_params
+                logger.error("Failed to place order")
             #self.current_orders = self.drift_api.get_user_orders_map()
             
         logger.info(f"Placed {len(self.current_orders)} orders")
@@ -574,7 +611,7 @@ class MarketMaker(Bot):
         """
         position: PositionType = await self.drift_api.get_position(self.market_index)
         if position:
-            self.position_size = Decimal(str(position.base_asset_amount)) / BASE_PRECISION
+            self.position_size = Decimal(position.base_asset_amount) / BASE_PRECISION
         else:
             self.position_size = Decimal('0')
         logger.info(f"Updated position size: {self.position_size}")
@@ -601,7 +638,11 @@ async def main():
     
     market_maker = MarketMaker(drift_api, config)
     await market_maker.init()
-    await market_maker.start_interval_loop()
+    try:
+        await market_maker.start_interval_loop()
+    finally:
+        await market_maker.close()
+        await drift_api.close()
 
 if __name__ == "__main__":
     asyncio.run(main())
\ No newline at end of file
@@ -1,13 +1,14 @@
 import logging
 import asyncio
+from functools import lru_cache
 from typing import Optional
 import pandas as pd
 import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
 from src.common.types import MarketAccountType, PositionType, TrendFollowingConfig, Bot
 from src.api.drift.api import DriftAPI
 from driftpy.constants.numeric_constants import BASE_PRECISION, PRICE_PRECISION, PERCENTAGE_PRECISION
 from decimal import Decimal
-import ccxt
 from driftpy.types import (
     MarketType,
     OrderType,
@@ -36,6 +37,19 @@ from spl.token.constants import TOKEN_PROGRAM_ID
 
 logger = logging.getLogger(__name__)
 
+TIMEFRAME_SECONDS = {
+    '1m': 60, '5m': 300, '15m': 900, '30m': 1800,
+    '1h': 3600, '4h': 14400, '1d': 86400
+}
+
+@lru_cache(maxsize=1)
+def get_exchange():
+    # Shared so markets and rate-limit state survive across refreshes.
+    # ccxt is imported here since importing it is slow and the factory
+    # loads this module even when only the market maker runs
+    import ccxt
+    return ccxt.bybit({'enableRateLimit': True})
+
 class TrendFollowingStrategy(Bot):
     def __init__(self, drift_api: DriftAPI, config: TrendFollowingConfig):
         self.drift_api = drift_api
@@ -89,7 +103,7 @@ class TrendFollowingStrategy(Bot):
             self.is_initialized = True
             logger.info("TrendFollowingStrategy initialized successfully")
         except Exception as e:
-            logger.error(f"Error during initialization: {str(e)}", exc_info=True)
+            logger.exception(f"Error during initialization: {str(e)}")
         
     def update_indicators(self):
         if not self.historical_data.empty:
@@ -97,18 +111,15 @@ class TrendFollowingStrategy(Bot):
             self.smoothed_alma = self.alma.rolling(self.smoothing_factor).mean()
             self.atr = self.historical_data['TR'].rolling(self.atr_length).mean()
             self.dynamic_threshold = self.atr * self.threshold_multiplier
-            self.upper_band = self.smoothed_alma + self.historical_data['Close'].rolling(self.exhaustion_swing_length).std() * 1.5
-            self.lower_band = self.smoothed_alma - self.historical_data['Close'].rolling(self.exhaustion_swing_length).std() * 1.5 
+            band_width = self.historical_data['Close'].rolling(self.exhaustion_swing_length).std() * 1.5
+            self.upper_band = self.smoothed_alma + band_width
+            self.lower_band = self.smoothed_alma - band_width
 
     # Fetch historical data from Bybit (or another exchange, if you like)
     async def update_historical_data(self, symbol, timeframe, start_date, end_date):
         try:
-            exchange = ccxt.bybit({'enableRateLimit': True})
-            
-            timeframe_seconds = {
-                '1m': 60, '5m': 300, '15m': 900, '30m': 1800,
-                '1h': 3600, '4h': 14400, '1d': 86400
-            }
+            exchange = get_exchange()
+            timeframe_step = pd.Timedelta(seconds=TIMEFRAME_SECONDS[timeframe])
             
             all_ohlcv = []
             current_date = pd.Timestamp(start_date).tz_localize(None)
@@ -116,10 +127,10 @@ class TrendFollowingStrategy(Bot):
             
             while current_date < end_datetime:
                 try:
-                    ohlcv = exchange.fetch_ohlcv(symbol, timeframe, exchange.parse8601(current_date.isoformat()), limit=1000)
+                    ohlcv = await asyncio.to_thread(exchange.fetch_ohlcv, symbol, timeframe, exchange.parse8601(current_date.isoformat()), limit=1000)
                     all_ohlcv.extend(ohlcv)
                     if len(ohlcv):
-                        current_date = pd.Timestamp(ohlcv[-1][0], unit='ms') + pd.Timedelta(seconds=timeframe_seconds[timeframe])
+                        current_date = pd.Timestamp(ohlcv[-1][0], unit='ms') + timeframe_step
                     else:
                         current_date += pd.Timedelta(days=1)
                 except Exception as e:
@@ -140,7 +151,7 @@ class TrendFollowingStrategy(Bot):
             
             return df
         except Exception as e:
-            logger.error(f"Error in update_historical_data: {str(e)}", exc_info=True)
+            logger.exception(f"Error in update_historical_data: {str(e)}")
             return None
 
     def alma_calc(self, price, window, offset, sigma):
@@ -149,10 +160,14 @@ class TrendFollowingStrategy(Bot):
         w = np.exp(-((np.arange(window) - m) ** 2) / (2 * s * s))
         w /= w.sum()
 
-        def alma(x):
-            return (np.convolve(x, w[::-1], mode='valid'))[0]
+        # Weighted sum over every full window at once, rather than a Python call per row
+        series = pd.Series(price)
+        values = series.to_numpy(dtype=float)
+        alma = np.full(len(values), np.nan)
+        if len(values) >= window:
+            alma[window - 1:] = sliding_window_view(values, window) @ w
 
-        return pd.Series(price).rolling(window).apply(alma, raw=True)
+        return pd.Series(alma, index=series.index)
 
     # Function to calculate True Range (used in ATR)
     def calculate_true_range(self, df):
@@ -260,7 +275,7 @@ class TrendFollowingStrategy(Bot):
         user = self.drift_api.drift_client.get_user()
         market = self.drift_api.get_market(self.market_index, self.config.market_type)
         market_price_data = self.drift_api.get_market_price_data(self.market_index, self.config.market_type)
-        price = Decimal(str(market_price_data.price)) / PRICE_PRECISION
+        price = Decimal(market_price_data.price) / PRICE_PRECISION
 
         # Calculate base asset amount using the provided position_value
         base_asset_amount = self.drift_api.drift_client.convert_to_perp_precision(position_value / price)
@@ -422,6 +437,10 @@ class TrendFollowingStrategy(Bot):
         except Exception as e:
             logger.error(f"Health check failed: {e}")
             return False
+
+    async def close(self):
+        # Nothing to release; the DriftAPI is owned and closed by the caller
+        pass
             
     def calculate_volatility(self):
         # market = self.drift_api.get_market(self.market_index, self.config.market_type)
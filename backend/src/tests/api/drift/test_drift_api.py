@@ -266,6 +266,18 @@ async def test_close_position_no_position(drift_api):
     assert result is None
     assert "No position found" in message
 
+@pytest.mark.asyncio
+async def test_close(drift_api, mock_drift_client):
+    mock_connection = AsyncMock()
+    drift_api.connection = mock_connection
+
+    await drift_api.close()
+
+    mock_drift_client.unsubscribe.assert_called_once()
+    mock_connection.close.assert_called_once()
+    assert drift_api.drift_client is None
+    assert drift_api.connection is None
+
 @pytest.mark.asyncio
 async def test_cancel_order(drift_api, mock_drift_client):
     mock_drift_client.cancel_order.return_value = "tx_signature"
@@ -0,0 +1,15 @@
+import pytest
+from src.api.drift.error import ErrorStatus
+
+
+@pytest.mark.parametrize("code, expected", [
+    (6001, "RETRY"),
+    (6004, "IGNORE"),
+    (6002, "CANCEL"),
+    (6000, "BLOCK"),
+    (1, None),
+])
+def test_error_status(code, expected):
+    error = {"error": {"code": code, "message": "error"}}
+
+    assert ErrorStatus.error_status(error) == expected
@@ -0,0 +1,66 @@
+import pytest
+from decimal import Decimal
+from unittest.mock import AsyncMock, MagicMock, patch
+from driftpy.types import MarketType
+from src.api.drift.api import DriftAPI
+from src.common.types import MarketMakerConfig
+from src.strategy.marketmaking import MarketMaker, TRADE_RECORDS_URL
+
+TRADE_RECORDS_CSV = "marketIndex,price,size\n0,150.5,2\n1,60000,1\n0,151.0,3\n"
+
+
+@pytest.fixture
+def market_maker():
+    config = MarketMakerConfig(
+        bot_id="mm_test",
+        strategy_type="market_making",
+        market_indexes=[0],
+        sub_accounts=[0],
+        market_type=MarketType.Perp(),
+        symbol="SOL-PERP",
+        timeframe="5m",
+        max_position_size=Decimal('100'),
+        order_size=Decimal('1'),
+        num_levels=2,
+        base_spread=Decimal('0.001'),
+        risk_factor=Decimal('0.005'),
+        inventory_target=Decimal('0')
+    )
+    return MarketMaker(MagicMock(spec=DriftAPI), config)
+
+
+def mock_response(status, text="", headers=None):
+    response = MagicMock()
+    response.status = status
+    response.headers = headers or {}
+    response.text = AsyncMock(return_value=text)
+    context = MagicMock()
+    context.__aenter__ = AsyncMock(return_value=response)
+    context.__aexit__ = AsyncMock(return_value=False)
+    return context
+
+
+@pytest.mark.asyncio
+async def test_get_trade_records_revalidates_with_etag(market_maker):
+    session = MagicMock()
+    session.get.side_effect = [
+        mock_response(200, TRADE_RECORDS_CSV, {'ETag': '"abc"'}),
+        mock_response(304),
+    ]
+    market_maker.session = session
+
+    first = await market_maker.get_trade_records()
+    with patch('src.strategy.marketmaking.pd.read_csv') as mock_read_csv:
+        second = await market_maker.get_trade_records()
+
+    assert list(first['price']) == [150.5, 151.0]
+    assert second is first
+    mock_read_csv.assert_not_called()
+    assert session.get.call_args_list[0].kwargs['headers'] == {}
+    session.get.assert_called_with(TRADE_RECORDS_URL, headers={'If-None-Match': '"abc"'})
+
+
+@pytest.mark.asyncio
+async def test_get_trade_records_requires_init(market_maker):
+    with pytest.raises(RuntimeError):
+        await market_maker.get_trade_records()